@@ -1,8 +1,9 @@
 import os
 from dotenv import load_dotenv
 import streamlit as st
+from streamlit.delta_generator import DeltaGenerator
 import anthropic
-from typing import Tuple
+from typing import Callable, Optional, Sequence, Tuple
 import sys
 from io import StringIO
 import contextlib
@@ -10,42 +11,140 @@ import traceback
 import ast
 import re
 import time
+import importlib
+import importlib.util
+import hashlib
+import functools
+import shutil
+import stat
+import threading
+from collections import OrderedDict
 
-# Load environment variables at startup
-load_dotenv()
+@st.cache_resource(show_spinner=False)
+def _env_api_key() -> str:
+    """Load environment variables once per process and return the Claude API key."""
+    load_dotenv()
+    return os.getenv('CLAUDE_API_KEY', '')
 
 class CodeExecutionError(Exception):
     pass
 
-def clean_code_from_response(code_text: str) -> str:
-    """Clean the code text from markdown and other formatting"""
-    # Remove markdown code blocks
-    code_text = re.sub(r'```python\s*\n', '', code_text)
-    code_text = re.sub(r'```\s*\n?', '', code_text)
-    
-    # Remove any leading/trailing whitespace
-    code_text = code_text.strip()
-    
-    # Remove italics and bold formatting
-    code_text = re.sub(r'\*\*(.+?)\*\*', r'\1', code_text)  # Bold
-    code_text = re.sub(r'\*(.+?)\*', r'\1', code_text)      # Italic
-    
-    # Remove any commented out markers
-    code_text = re.sub(r'^#\s*```.*$', '', code_text, flags=re.MULTILINE)
+@st.cache_resource(show_spinner=False)
+def _allowed_modules() -> dict:
+    """Modules exposed to executed code, built once per process (treat as read-only)"""
+    # Streamlit re-executes the script on every rerun, so this can't live at module level
+    allowed = {
+        name: importlib.import_module(name)
+        for name in (
+            "random", "math", "datetime", "json", "re",
+            "collections", "itertools", "statistics", "time"
+        )
+    }
     
-    # Fix any repeated newlines
-    code_text = re.sub(r'\n\s*\n\s*\n', '\n\n', code_text)
+    try:
+        # Try to import colorama, but have a fallback if it's not installed
+        import colorama
+        colorama.init()
+        allowed.update({
+            "colorama": colorama,
+            "Fore": colorama.Fore,
+            "Back": colorama.Back,
+            "Style": colorama.Style
+        })
+    except ImportError:
+        pass
     
-    return code_text
-
-def is_safe_code(code: str) -> bool:
-    """Basic security check for code."""
-    forbidden = [
-        'open(', 'exec(', 'eval(', 'subprocess', 
-        'import os', 'import sys', '__import__', 
-        'importlib', 'system(', 'popen('
-    ]
-    return not any(dangerous in code.lower() for dangerous in forbidden)
+    return allowed
+
+# Numba is optional and only imported once JIT is enabled, as importing it
+# (and llvmlite) is slow; without it executed code simply runs under CPython
+_NUMBA_AVAILABLE = importlib.util.find_spec("numba") is not None
+
+def _load_numba():
+    """Import numba on first use"""
+    import numba
+    import numba.core.errors
+    return numba
+
+# Single-pass pattern for clean_code_from_response; alternatives are tried in
+# the order the separate passes used to run, so bold wins over italic. There is
+# no commented-fence alternative: the old `^#\s*```` pass ran after every fence
+# had been stripped and never matched, and fusing it in would change output
+_RE_FUSED = re.compile(
+    r'(?P<fence>```(?:python)?\s*\n?)'
+    r'|(?P<bold>\*\*(?P<bold_text>.+?)\*\*)'
+    r'|(?P<ital>\*(?P<ital_text>.+?)\*)'
+    r'|(?P<blanks>\n\s*\n\s*\n)'
+)
+
+def _repl(match: re.Match) -> str:
+    """Replacement for each markdown construct matched by _RE_FUSED"""
+    kind = match.lastgroup
+    if kind == 'bold':
+        return match.group('bold_text')
+    if kind == 'ital':
+        return match.group('ital_text')
+    if kind == 'blanks':
+        return '\n\n'
+    return ''
+
+def clean_code_from_response(code_text: str) -> str:
+    """Clean the code text from markdown and other formatting"""
+    # Remove code fences, bold/italics and repeated newlines in one scan
+    return _RE_FUSED.sub(_repl, code_text).strip()
+
+_BANNED_CALLS = frozenset({'open', 'exec', 'eval', 'system', 'popen', '__import__'})
+_BANNED_MODULES = frozenset({'os', 'sys', 'subprocess', 'importlib', 'builtins'})
+
+class _SafetyVisitor(ast.NodeVisitor):
+    """Basic security check for code, run over its parsed AST"""
+
+    def __init__(self):
+        # Set when the code calls input(), so execute_code can supply a scripted stub
+        self.needs_input_stub = False
+
+    def _reject(self, name: str):
+        raise CodeExecutionError(f"Code contains potentially unsafe operations: {name}")
+
+    def visit(self, node: ast.AST):
+        # ast.walk is iterative, so deeply nested expressions that compile fine
+        # can't exhaust the stack the way recursive generic_visit would
+        for child in ast.walk(node):
+            method = getattr(self, 'visit_' + child.__class__.__name__, None)
+            if method is not None:
+                method(child)
+
+    def visit_Call(self, node: ast.Call):
+        func = node.func
+        if isinstance(func, ast.Name) and func.id == 'input':
+            self.needs_input_stub = True
+        # getattr(obj, "exec") reaches a banned name without naming it directly
+        if isinstance(func, ast.Name) and func.id == 'getattr':
+            for arg in node.args[1:2]:
+                if isinstance(arg, ast.Constant) and arg.value in _BANNED_CALLS:
+                    self._reject(f"getattr(..., {arg.value!r})")
+
+    def visit_Name(self, node: ast.Name):
+        # Any reference counts, not just calls, so f = exec; f(...) is caught too
+        if node.id in _BANNED_CALLS or node.id == '__builtins__':
+            self._reject(node.id)
+
+    def visit_Attribute(self, node: ast.Attribute):
+        # e.g. os.system(...) or f = builtins.open
+        if node.attr in _BANNED_CALLS:
+            self._reject(node.attr)
+
+    def visit_Import(self, node: ast.Import):
+        for alias in node.names:
+            if alias.name.split('.')[0] in _BANNED_MODULES:
+                self._reject(f"import {alias.name}")
+
+    def visit_ImportFrom(self, node: ast.ImportFrom):
+        if node.module and node.module.split('.')[0] in _BANNED_MODULES:
+            self._reject(f"from {node.module} import")
+        for alias in node.names:
+            if alias.name in _BANNED_CALLS:
+                self._reject(f"from {node.module} import {alias.name}")
 
 @contextlib.contextmanager
 def capture_output():
@@ -54,99 +153,328 @@ def capture_output():
     old_out, old_err = sys.stdout, sys.stderr
     try:
         sys.stdout, sys.stderr = new_out, new_err
-        yield sys.stdout, sys.stderr
+        yield new_out, new_err
     finally:
         sys.stdout, sys.stderr = old_out, old_err
+        # Callers read getvalue() inside the with block, so the buffers can go now
+        new_out.close()
+        new_err.close()
 
-def execute_code(code: str) -> Tuple[str, str, str]:
-    """Execute the code and return stdout, stderr, and any exception message."""
-    if not is_safe_code(code):
-        raise CodeExecutionError("Code contains potentially unsafe operations")
+def format_exception(exc: BaseException) -> str:
+    """Format an exception returned by execute_code for display."""
+    formatted = ''.join(traceback.format_exception(type(exc), exc, exc.__traceback__))
+    return f"{type(exc).__name__}: {str(exc)}\n{formatted}"
 
-    output, error, exception_msg = "", "", ""
-    
-    try:
-        # Try to import colorama, but have a fallback if it's not installed
-        colorama = __import__('colorama')
-        colorama.init()
-    except ImportError:
-        colorama = None
-        
-    allowed_modules = {
-        "random": __import__("random"),
-        "math": __import__("math"),
-        "datetime": __import__("datetime"),
-        "json": __import__("json"),
-        "re": __import__("re"),
-        "collections": __import__("collections"),
-        "itertools": __import__("itertools"),
-        "statistics": __import__("statistics"),
-        "time": __import__("time")
+def _run_record(output: str, error: str, exception: Optional[BaseException]) -> dict:
+    """Build the session-state record of a run, with the exception already formatted"""
+    # Keeping only the text means the traceback can't hold the program's frames alive
+    return {
+        'output': output,
+        'error': error,
+        'exception': format_exception(exception) if exception is not None else ''
     }
-    
-    if colorama:
-        allowed_modules.update({
-            "colorama": colorama,
-            "Fore": colorama.Fore,
-            "Back": colorama.Back,
-            "Style": colorama.Style
-        })
+
+def _scripted_input(test_inputs: Sequence[str]) -> Callable[..., str]:
+    """Build an input() replacement that returns the given test inputs in order."""
+    remaining = iter(test_inputs)
+
+    def _input(prompt: str = '') -> str:
+        print(prompt, end='')
+        try:
+            value = next(remaining)
+        except StopIteration:
+            raise EOFError("No test inputs left; add more in the sidebar") from None
+        # Echo the value as a terminal would, so the output reads naturally
+        print(value)
+        return value
+
+    return _input
+
+# Names an njit-eligible function may read besides its own arguments and locals
+_NJIT_NAMES = frozenset({'math', 'range', 'abs', 'min', 'max', 'int', 'float', 'bool', 'round'})
+
+# Node types allowed in an njit-eligible function body; anything else (strings,
+# containers, print and other I/O, nested scopes) keeps the function on CPython.
+# print is excluded as numba writes it to the C-level stdout, bypassing capture_output.
+_NJIT_NODES = (
+    ast.Return, ast.Assign, ast.AugAssign, ast.For, ast.While, ast.If,
+    ast.Break, ast.Continue, ast.Pass, ast.Expr,
+    ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp, ast.Call,
+    ast.Name, ast.Attribute, ast.Constant, ast.Tuple,
+    ast.expr_context, ast.operator, ast.unaryop, ast.boolop, ast.cmpop
+)
+
+def _is_njit_eligible(node: ast.FunctionDef) -> bool:
+    """Whether a function only runs numeric loops that numba can compile."""
+    args = node.args
+    if (node.decorator_list or args.posonlyargs or args.vararg
+            or args.kwonlyargs or args.kwarg or args.defaults):
+        return False
+
+    body = node.body[1:] if ast.get_docstring(node) is not None else node.body
+    nodes = [child for stmt in body for child in ast.walk(stmt)]
+    local_names = {arg.arg for arg in args.args}
+    local_names.update(
+        child.id for child in nodes
+        if isinstance(child, ast.Name) and isinstance(child.ctx, ast.Store)
+    )
+
+    has_loop = False
+    for child in nodes:
+        if not isinstance(child, _NJIT_NODES):
+            return False
+        if isinstance(child, ast.Constant) and not isinstance(child.value, (int, float)):
+            return False
+        if (isinstance(child, ast.Name) and isinstance(child.ctx, ast.Load)
+                and child.id not in local_names and child.id not in _NJIT_NAMES):
+            return False
+        if isinstance(child, ast.Attribute) and not (
+                isinstance(child.value, ast.Name) and child.value.id == 'math'):
+            return False
+        has_loop = has_loop or isinstance(child, (ast.For, ast.While))
+    # Without a loop the compile time outweighs anything numba could save
+    return has_loop
+
+def _inject_njit(tree: ast.Module) -> bool:
+    """Decorate eligible top-level functions with _njit; return whether any were"""
+    # Compute every key before touching the tree, so an error from ast.dump
+    # leaves it undecorated
+    eligible = [
+        (node, hashlib.blake2b(ast.dump(node).encode(), digest_size=16).hexdigest())
+        for node in tree.body
+        if isinstance(node, ast.FunctionDef) and _is_njit_eligible(node)
+    ]
+    for node, key in eligible:
+        node.decorator_list.append(ast.Call(
+            func=ast.Name(id='_njit', ctx=ast.Load()),
+            args=[ast.Constant(key)],
+            keywords=[]
+        ))
+    ast.fix_missing_locations(tree)
+    return bool(eligible)
+
+# Snippets with JIT-compiled functions live here, each with numba's __pycache__
+# beside it, so removing a snippet directory also removes its compiled code
+_SNIPPET_ROOT = os.path.join(os.path.expanduser('~'), '.cache', 'code-editor', 'numba-snippets')
+_SNIPPET_LIMIT = 64
+
+def _private_dir(path: str) -> str:
+    """Create path if needed, raising OSError unless it is private to this user"""
+    # numba's .nbi index files are pickles, so nobody else may be able to plant them
+    os.makedirs(path, mode=0o700, exist_ok=True)
+    info = os.lstat(path)
+    if not stat.S_ISDIR(info.st_mode):
+        raise OSError(f"{path} is not a directory")
+    if hasattr(os, 'getuid') and (info.st_uid != os.getuid() or info.st_mode & 0o077):
+        raise OSError(f"{path} is not private to the current user")
+    return path
+
+def _prune_snippets(root: str):
+    """Remove the least recently used snippet directories beyond _SNIPPET_LIMIT."""
+    with os.scandir(root) as entries:
+        dirs = [entry for entry in entries if entry.is_dir(follow_symlinks=False)]
+    if len(dirs) <= _SNIPPET_LIMIT:
+        return
+    dirs.sort(key=lambda entry: entry.stat(follow_symlinks=False).st_mtime)
+    for entry in dirs[:-_SNIPPET_LIMIT]:
+        shutil.rmtree(entry.path, ignore_errors=True)
+
+def _snippet_file(code: str) -> Optional[str]:
+    """Write code to a per-hash snippet file for numba's cache; None if it can't be stored"""
+    # cache=True needs a real source file. The file is never rewritten, so
+    # its timestamp stays valid for numba across reruns
+    digest = hashlib.blake2b(code.encode()).hexdigest()
+    try:
+        root = _private_dir(_SNIPPET_ROOT)
+        directory = os.path.join(root, digest[:32])
+        path = os.path.join(directory, 'snippet.py')
+        if os.path.isdir(directory):
+            # Mark as recently used for _prune_snippets
+            os.utime(directory)
+        else:
+            os.mkdir(directory, 0o700)
+            _prune_snippets(root)
+        try:
+            with open(path, 'x', encoding='utf-8') as f:
+                try:
+                    f.write(code)
+                except OSError:
+                    # Don't leave a truncated snippet behind for later runs
+                    os.unlink(path)
+                    raise
+        except FileExistsError:
+            pass
+    except OSError:
+        return None
+    return path
+
+# Bounded so dispatchers for functions no session runs any more get released
+@st.cache_resource(show_spinner=False, max_entries=64)
+def _get_dispatcher(key: str, persist: bool, _func: Callable) -> Callable:
+    """Numba dispatcher for the function with the given AST key"""
+    # _func isn't hashed (leading underscore), so later runs of the same AST
+    # reuse the first run's dispatcher
+    if persist:
+        try:
+            return _load_numba().njit(cache=True)(_func)
+        except (RuntimeError, OSError):
+            # numba found no writable cache location for the source file
+            pass
+    return _load_numba().njit(_func)
+
+# Range of numba's int64, outside of which integer arguments stay on CPython
+_INT64_MIN, _INT64_MAX = -2 ** 63, 2 ** 63 - 1
+
+def _jit_args_supported(args: tuple) -> bool:
+    """Whether every argument is a scalar numba handles without reflection."""
+    for arg in args:
+        # Exact type checks: bool and int subclasses, lists (reflected, with
+        # deprecation warnings on stderr) and anything else run on CPython
+        if type(arg) is float:
+            continue
+        if type(arg) is int and _INT64_MIN <= arg <= _INT64_MAX:
+            continue
+        return False
+    return True
+
+def _jit_or_python(key: str, persist: bool = False) -> Callable[[Callable], Callable]:
+    """Decorator exposed to executed code as _njit, with a plain-Python fallback"""
+    def decorate(func: Callable) -> Callable:
+        jitted = _get_dispatcher(key, persist, func)
+        numba_error = _load_numba().core.errors.NumbaError
+        use_python = False
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            nonlocal use_python
+            # Keyword calls go straight to Python, which binds them as usual
+            if not use_python and not kwargs and _jit_args_supported(args):
+                try:
+                    return jitted(*args)
+                except numba_error:
+                    # Not compilable; stay on Python for the rest of the run
+                    use_python = True
+            return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorate
+
+def execute_code(code: str, test_inputs: Sequence[str] = (),
+                 use_jit: bool = False) -> Tuple[str, str, Optional[BaseException]]:
+    """Execute the code and return stdout, stderr, and any exception raised."""
+    visitor = _SafetyVisitor()
+    try:
+        # Parse once; the same tree is checked for safety and compiled below
+        tree = ast.parse(code, '<string>', 'exec')
+        visitor.visit(tree)
+    except (SyntaxError, ValueError, RecursionError, MemoryError) as e:
+        # Deeply nested code can exhaust the parser; report it like any
+        # other error in the program
+        return "", "", e
+    filename = '<string>'
+    # Opt-in only: numba's fixed-width integers can change results
+    if use_jit:
+        try:
+            _load_numba()
+        except ImportError:
+            use_jit = False
+    try:
+        injected = use_jit and _inject_njit(tree)
+    except RecursionError:
+        # ast.dump recurses per node; very deep functions just run on CPython
+        injected = use_jit = False
+    if injected:
+        # Without a snippet file the functions still compile, just not to disk
+        filename = _snippet_file(code) or filename
+
+    output, error, exception = "", "", None
     
     # Add the modules to the globals dict along with builtins
     globals_dict = {
         "__builtins__": __builtins__,
-        **allowed_modules
+        **_allowed_modules()
     }
+    if visitor.needs_input_stub:
+        globals_dict["input"] = _scripted_input(test_inputs)
+    if use_jit:
+        globals_dict["_njit"] = functools.partial(_jit_or_python, persist=filename != '<string>')
     
     with capture_output() as (out, err):
         try:
-            compiled_code = compile(code, '<string>', 'exec')
+            try:
+                compiled_code = compile(tree, filename, 'exec')
+            except RecursionError:
+                # Converting a very deep tree back for the compiler recurses per
+                # node; compiling the source copes, at the cost of a second parse
+                compiled_code = compile(code, '<string>', 'exec')
             local_dict = {}
             exec(compiled_code, globals_dict, local_dict)
             output = out.getvalue()
             error = err.getvalue()
         except Exception as e:
             error = err.getvalue()
-            exception_msg = f"{type(e).__name__}: {str(e)}\n{traceback.format_exc()}"
+            # Formatting the traceback is left to the caller via format_exception
+            exception = e
     
-    return output, error, exception_msg
+    return output, error, exception
 
 def parse_claude_response(response: str) -> Tuple[str, str]:
     """Parse Claude's response into feedback and code sections."""
-    try:
-        feedback = ""
-        code = ""
-        
-        if "---FEEDBACK---" in response:
-            feedback = response.split("---FEEDBACK---")[1].split("---CODE---")[0].strip()
-            
-        if "---CODE---" in response:
-            code = response.split("---CODE---")[1].strip()
-            code = clean_code_from_response(code)
-            
-        return feedback, code
-    except Exception as e:
-        st.error(f"Error parsing response: {e}")
-        return response, ""
+    head, _, after = response.partition("---CODE---")
+    _, _, feedback = head.partition("---FEEDBACK---")
+    code = clean_code_from_response(after) if after else ""
+    return feedback.strip(), code
 
-def process_code(api_key: str, task_description: str, code: str) -> Tuple[str, str]:
-    """Process the code using Claude API and return feedback and refined code."""
-    client = anthropic.Client(api_key=api_key)
-    
-    prompt = f"""
-Task Description: {task_description}
+# Bounded so clients (and their connection pools) for stale keys get released
+@st.cache_resource(show_spinner=False, max_entries=8)
+def _get_client(api_key: str) -> anthropic.Client:
+    """Create one Claude client per API key so its connection pool is reused across reruns."""
+    return anthropic.Client(api_key=api_key)
+
+_RESPONSE_CACHE_SIZE = 64
+_RESPONSE_CACHE_TTL = 3600
+
+class _ResponseCache:
+    """Bounded, time-limited store of analysis results keyed on (api key hash, task, code)"""
+    # Used instead of st.cache_data, which would replay every streamed placeholder update
 
-Original Code:
-```python
-{code}
-```
+    def __init__(self):
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key: Tuple[str, str, str]) -> Optional[Tuple[str, str]]:
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            stored_at, result = entry
+            if time.monotonic() - stored_at > _RESPONSE_CACHE_TTL:
+                del self._entries[key]
+                return None
+            self._entries.move_to_end(key)
+            return result
+
+    def put(self, key: Tuple[str, str, str], result: Tuple[str, str]):
+        with self._lock:
+            self._entries[key] = (time.monotonic(), result)
+            self._entries.move_to_end(key)
+            while len(self._entries) > _RESPONSE_CACHE_SIZE:
+                self._entries.popitem(last=False)
+
+@st.cache_resource(show_spinner=False)
+def _get_response_cache() -> _ResponseCache:
+    """Share one response cache across reruns and sessions."""
+    return _ResponseCache()
+
+# Fixed instructions sent as the system prompt ahead of each request
+_SYSTEM_PROMPT = """You review Python code against a task description.
 
 Please provide:
 1. A detailed code review and feedback
 2. A refined version of the code that implements the requested changes
-3. Make sure the code doesn't require user input and uses test cases instead
-4. Prefer using emoji-based output over terminal colors for better compatibility
-5. If using colors, use only standard print statements or emojis
+3. Prefer using emoji-based output over terminal colors for better compatibility
+4. If using colors, use only standard print statements or emojis
 
 Format your response exactly as follows:
 ---FEEDBACK---
@@ -155,16 +483,74 @@ Format your response exactly as follows:
 [The refined code here without any markdown formatting or additional explanation within the code section]
 """
 
+# Minimum seconds between placeholder redraws while streaming
+_STREAM_REFRESH_INTERVAL = 0.15
+
+def _stream_response(client: anthropic.Client, task_description: str, code: str,
+                     placeholder: DeltaGenerator) -> Tuple[str, bool]:
+    """Stream Claude's response into the placeholder; return the text and whether it finished"""
+    prompt = f"Task: {task_description}\n\n```python\n{code}\n```"
+
+    chunks = []
     try:
-        message = client.messages.create(
+        with client.messages.stream(
             model="claude-3-sonnet-20240229",
             max_tokens=2048,
+            system=_SYSTEM_PROMPT,
             messages=[{"role": "user", "content": prompt}]
-        )
-        return parse_claude_response(message.content[0].text)
+        ) as stream:
+            last_refresh = 0.0
+            for text in stream.text_stream:
+                chunks.append(text)
+                # Redrawing re-sends the whole buffer, so do it at a bounded rate
+                now = time.monotonic()
+                if now - last_refresh >= _STREAM_REFRESH_INTERVAL:
+                    placeholder.markdown(''.join(chunks))
+                    last_refresh = now
+            complete = stream.get_final_message().stop_reason != "max_tokens"
+    finally:
+        # The parsed feedback and code are shown in the output column instead
+        placeholder.empty()
+    return ''.join(chunks), complete
+
+def process_code(api_key: str, task_description: str, code: str,
+                 placeholder: DeltaGenerator) -> Tuple[str, str]:
+    """Process the code using Claude API and return feedback and refined code."""
+    # Key on a digest of the API key so the raw key isn't held in the cache
+    api_key_hash = hashlib.blake2b(api_key.encode(), digest_size=8).hexdigest()
+    cache_key = (api_key_hash, task_description, code)
+    cache = _get_response_cache()
+    
+    cached = cache.get(cache_key)
+    if cached is not None:
+        return cached
+    
+    try:
+        response, complete = _stream_response(_get_client(api_key), task_description, code, placeholder)
     except Exception as e:
         st.error(f"Error calling Claude API: {e}")
         return "", ""
+    
+    result = parse_claude_response(response)
+    # Only keep well-formed answers, so a truncated or off-format one can be retried
+    feedback, refined_code = result
+    if complete and feedback and refined_code:
+        cache.put(cache_key, result)
+    return result
+
+# Static sidebar help text. Streamlit still re-executes this assignment on every
+# rerun, but it only rebinds a constant from the compiled script
+_HELP_TEXT = """
+### How to use:
+1. Enter your Claude API key (or set it in .env file)
+2. Describe your task
+3. Paste your code
+4. Click 'Analyze Code' for AI feedback
+5. Use 'Run Code' to test either version
+
+Note: For interactive programs, input() calls are answered from the 
+'Test Inputs' box above instead of waiting for user input.
+"""
 
 def main():
     st.set_page_config(
@@ -178,9 +564,9 @@ def main():
     # Initialize session state
     if 'api_key' not in st.session_state:
         # Try to get API key from environment variables first
-        st.session_state.api_key = os.getenv('CLAUDE_API_KEY', '')
-    if 'run_clicked' not in st.session_state:
-        st.session_state.run_clicked = False
+        st.session_state.api_key = _env_api_key()
+    # Result of the most recent run as built by _run_record, or None
+    st.session_state.setdefault('last_run', None)
     
     # Settings section with API key in sidebar
     with st.sidebar:
@@ -193,22 +579,39 @@ def main():
         )
         st.session_state.api_key = api_key
         
-        st.markdown("---")
-        st.markdown("""
-        ### How to use:
-        1. Enter your Claude API key (or set it in .env file)
-        2. Describe your task
-        3. Paste your code
-        4. Click 'Analyze Code' for AI feedback
-        5. Use 'Run Code' to test either version
+        test_inputs = st.text_area(
+            "Test Inputs",
+            height=100,
+            placeholder="One value per line",
+            help="Values returned, in order, by input() calls when running code."
+        )
+        st.session_state.test_inputs = test_inputs.splitlines()
+        
+        use_jit = False
+        if _NUMBA_AVAILABLE:
+            use_jit = st.checkbox(
+                "JIT-compile numeric loops (numba)",
+                help="Runs simple numeric loop functions through numba when running code."
+            )
+            if use_jit:
+                st.caption(
+                    "⚠️ numba uses 64-bit integers, so large results wrap around "
+                    "silently, and some math errors return nan instead of raising."
+                )
+        st.session_state.use_jit = use_jit
         
-        Note: For interactive programs, the code will be modified to use test cases 
-        instead of requiring user input.
-        """)
+        st.markdown("---")
+        st.markdown(_HELP_TEXT)
     
     # Main content area
     col1, col2 = st.columns([1, 1])
     
+    # Set up the output column first so a streamed response can be shown there
+    # while the Analyze button in col1 is being handled
+    with col2:
+        st.subheader("Output")
+        stream_placeholder = st.empty()
+    
     with col1:
         st.subheader("Input")
         task_description = st.text_area(
@@ -233,27 +636,24 @@ def main():
                     st.error("Please provide some code to analyze")
                 else:
                     with st.spinner("Analyzing your code..."):
-                        feedback, refined_code = process_code(api_key, task_description, code)
+                        feedback, refined_code = process_code(
+                            api_key, task_description, code, stream_placeholder
+                        )
                         st.session_state.feedback = feedback
                         st.session_state.refined_code = refined_code
                         # Reset run state when new code is analyzed
-                        st.session_state.run_clicked = False
+                        st.session_state.last_run = None
         
         with col1_2:
             if st.button("Run Original Code"):
                 with st.spinner("Running code..."):
                     try:
-                        output, error, exception = execute_code(code)
-                        st.session_state.current_output = output
-                        st.session_state.current_error = error
-                        st.session_state.current_exception = exception
-                        st.session_state.run_clicked = True
+                        output, error, exception = execute_code(code, st.session_state.test_inputs, st.session_state.use_jit)
+                        st.session_state.last_run = _run_record(output, error, exception)
                     except CodeExecutionError as e:
                         st.error(str(e))
     
     with col2:
-        st.subheader("Output")
-        
         # Feedback section
         if 'feedback' in st.session_state and st.session_state.feedback:
             with st.expander("📝 Feedback", expanded=True):
@@ -282,32 +682,34 @@ def main():
                     )
                     
                     if st.button("▶️ Run Code"):
-                        st.session_state.run_clicked = True
                         with st.spinner("Running code..."):
                             try:
-                                output, error, exception = execute_code(st.session_state.refined_code)
-                                st.session_state.current_output = output
-                                st.session_state.current_error = error
-                                st.session_state.current_exception = exception
+                                output, error, exception = execute_code(
+                                    st.session_state.refined_code,
+                                    st.session_state.test_inputs,
+                                    st.session_state.use_jit
+                                )
+                                st.session_state.last_run = _run_record(output, error, exception)
                             except CodeExecutionError as e:
                                 st.error(str(e))
     
     # New section at the bottom of the page for execution output
-    if 'run_clicked' in st.session_state and st.session_state.run_clicked:
+    run = st.session_state.get('last_run')
+    if run:
         st.markdown("---")
         st.subheader("🖥️ Execution Output")
         
         output_container = st.container()
         with output_container:
-            if hasattr(st.session_state, 'current_output') and st.session_state.current_output:
+            if run['output']:
                 st.markdown("**Program Output:**")
-                st.code(st.session_state.current_output, language='python')
-            if hasattr(st.session_state, 'current_error') and st.session_state.current_error:
+                st.code(run['output'], language='python')
+            if run['error']:
                 st.markdown("**Error Output:**")
-                st.code(st.session_state.current_error, language='bash')
-            if hasattr(st.session_state, 'current_exception') and st.session_state.current_exception:
+                st.code(run['error'], language='bash')
+            if run['exception']:
                 st.markdown("**Exception:**")
-                st.code(st.session_state.current_exception, language='bash')
+                st.code(run['exception'], language='bash')
 
 if __name__ == "__main__":
     main()